@@ -1,39 +1,87 @@
 import logging
 import os
+import random
+import signal
+import sys
+import threading
 import time
+from dataclasses import dataclass
+from functools import lru_cache
 from http import HTTPStatus
-from logging.handlers import RotatingFileHandler
+from typing import Optional
 
+import orjson
 import requests
-import telegram
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from exceptions import GetStatusException, SendMessageError
 
-load_dotenv()
+TOKEN_NAMES = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
+
+
+def _load_env():
+    """Загружает .env, только если переменных нет в окружении."""
+    if all(os.getenv(name) for name in TOKEN_NAMES):
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+_load_env()
+
+LOG_LEVEL = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO
 
 logging.basicConfig(
-    level=logging.DEBUG,
-    filename='main.log',
-    format='%(funcName)s, %(lineno)s, %(levelname)s, %(message)s',
-    filemode='w',
+    level=LOG_LEVEL,
+    format='%(asctime)s, %(levelname)s, %(funcName)s, %(lineno)s, %(message)s',
+    stream=sys.stdout,
 )
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = RotatingFileHandler(
-    'my_logger.log',
-    maxBytes=50000000,
-    backupCount=5,
-)
-logger.addHandler(handler)
+# urllib3 пишет URL запроса в DEBUG, а в URL Telegram есть токен бота.
+logging.getLogger('urllib3').setLevel(max(LOG_LEVEL, logging.INFO))
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 300
+MIN_POLL_INTERVAL = 30
+MAX_POLL_INTERVAL = 3600
+POLL_INTERVAL_FACTOR = 1.5
+POLL_JITTER = 0.2
+MAX_RETRY_TIME = 3600
+MAX_FAILURES = 10
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+API_TIMEOUT = (5, 30)
+TELEGRAM_ENDPOINT = f'https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage'
+TELEGRAM_TIMEOUT = (5, 15)
+CACHE_TTL = 60
+CACHE_FALLBACK_ENABLED = False
+
+SESSION = requests.Session()
+SESSION.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=1,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    ),
+)
+
+TELEGRAM_SESSION = requests.Session()
+TELEGRAM_SESSION.mount(
+    'https://',
+    HTTPAdapter(pool_connections=1, pool_maxsize=1),
+)
 
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -41,28 +89,79 @@ HOMEWORK_STATUSES = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.',
 }
 
+API_REQUEST_ERROR = 'Ошибка при запросе к API: %s'
+API_STATUS_ERROR = '"%s" - недоступен. Код ответа API: %s'
+API_DECODE_ERROR = 'Ответ API не является корректным JSON: %s'
+SEND_MESSAGE_ERROR = 'Ошибка при отправке сообщения: %s'
+TELEGRAM_STATUS_ERRORS = {
+    HTTPStatus.UNAUTHORIZED: 'Недействительный токен Telegram-бота: %s',
+    HTTPStatus.BAD_REQUEST: 'Некорректный запрос к Telegram: %s',
+    HTTPStatus.TOO_MANY_REQUESTS: 'Превышен лимит запросов к Telegram: %s',
+}
+TELEGRAM_STATUS_ERROR = 'Telegram недоступен. Код ответа: %s'
+
+_MISSING = object()
+_PARAMS = {'from_date': 0}
+_cache = {'ts': 0, 'from_date': None, 'response': None}
+_stop = threading.Event()
+
+
+@dataclass
+class BotState:
+    """Состояние цикла опроса API между итерациями."""
+
+    current_timestamp: int = 0
+    last_homework_key: Optional[tuple] = None
+    last_error_message: str = ''
+    poll_interval: float = MIN_POLL_INTERVAL
+    current_delay: float = RETRY_TIME
+    consecutive_failures: int = 0
+
+
+def _cache_fallback(error_message):
+    """Возвращает последний успешный ответ API или выбрасывает ошибку."""
+    if CACHE_FALLBACK_ENABLED and _cache['response'] is not None:
+        logger.warning(f'{error_message}. Используется ответ из кеша')
+        return _cache['response']
+    raise GetStatusException(error_message)
+
 
 def get_api_answer(timestamp):
     """Выполняет запрос к эндпоинту API-сервиса."""
-    params = {'from_date': timestamp}
+    _PARAMS['from_date'] = timestamp or int(time.time())
+
+    if (
+        _cache['from_date'] == _PARAMS['from_date']
+        and time.time() - _cache['ts'] < CACHE_TTL
+    ):
+        return _cache['response']
 
     try:
-        homework_statuses = requests.get(
+        homework_statuses = SESSION.get(
             url=ENDPOINT,
             headers=HEADERS,
-            params=params,
+            params=_PARAMS,
+            timeout=API_TIMEOUT,
         )
     except requests.exceptions.RequestException as error:
-        error_message = f'Ошибка при запросе к API: {error}'
-        raise GetStatusException(error_message)
+        return _cache_fallback(API_REQUEST_ERROR % error)
 
     status_code = homework_statuses.status_code
     if status_code != HTTPStatus.OK:
-        raise GetStatusException(
-            f'"{ENDPOINT}" - недоступен. Код ответа API: {status_code}'
-        )
+        return _cache_fallback(API_STATUS_ERROR % (ENDPOINT, status_code))
 
-    return homework_statuses.json()
+    if not homework_statuses.content:
+        return {}
+
+    try:
+        response = orjson.loads(homework_statuses.content)
+    except orjson.JSONDecodeError as error:
+        return _cache_fallback(API_DECODE_ERROR % error)
+
+    _cache.update(
+        ts=time.time(), from_date=_PARAMS['from_date'], response=response
+    )
+    return response
 
 
 def check_response(response):
@@ -70,89 +169,207 @@ def check_response(response):
     if not isinstance(response, dict):
         raise TypeError('Ответ API не является словарем')
 
-    if 'homeworks' not in response:
-        raise KeyError('Отсутствует ключ "homework_name" в ответе API')
-
-    homeworks = response['homeworks']
+    homeworks = response.get('homeworks', _MISSING)
+    if homeworks is _MISSING:
+        raise KeyError('Отсутствует ключ "homeworks" в ответе API')
 
     if not isinstance(homeworks, list):
         raise TypeError('Ответ API не является списком')
 
+    if not isinstance(response.get('current_date', 0), int):
+        raise TypeError('Ключ "current_date" в ответе API не является числом')
+
     return homeworks
 
 
 def parse_status(homework):
     """Извлекает статус работы из информации о конкретной домашней работе."""
-    if 'homework_name' not in homework:
+    homework_name = homework.get('homework_name', _MISSING)
+    if homework_name is _MISSING:
         raise KeyError('Отсутствует ключ "homework_name" в ответе API')
 
-    if 'status' not in homework:
+    homework_status = homework.get('status', _MISSING)
+    if homework_status is _MISSING:
         raise KeyError('Отсутствует ключ "status" в ответе API')
 
-    homework_name = homework['homework_name']
-    homework_status = homework['status']
+    return _render_status(homework_name, homework_status)
 
-    verdict = HOMEWORK_STATUSES[homework_status]
-    message = f'Изменился статус проверки работы "{homework_name}". {verdict}'
-    return message
+
+@lru_cache(maxsize=64)
+def _render_status(homework_name, homework_status):
+    """Формирует сообщение об изменении статуса домашней работы."""
+    verdict = HOMEWORK_STATUSES.get(homework_status)
+    if verdict is None:
+        raise ValueError(
+            f'Недокументированный статус домашней работы: {homework_status}'
+        )
+
+    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
 def check_tokens():
     """Проверяет доступ к переменным окружения, необходимых для работы бота."""
-    return PRACTICUM_TOKEN and TELEGRAM_TOKEN and TELEGRAM_CHAT_ID
+    tokens = {name: globals()[name] for name in TOKEN_NAMES}
+    missing_tokens = [
+        name for name, value in tokens.items()
+        if str(value or '').strip() in ('', 'None')
+    ]
+    if missing_tokens:
+        logger.critical(
+            f'Отсутствуют переменные окружения: {", ".join(missing_tokens)}'
+        )
+        return False
+
+    if ':' not in TELEGRAM_TOKEN:
+        logger.critical('Некорректный формат TELEGRAM_TOKEN')
+        return False
 
+    if not str(TELEGRAM_CHAT_ID).lstrip('-').isdigit():
+        logger.critical('Некорректный формат TELEGRAM_CHAT_ID')
+        return False
 
-def send_message(bot, message):
+    return True
+
+
+def _telegram_error_details(response):
+    """Извлекает описание ошибки из ответа Telegram Bot API."""
+    try:
+        payload = response.json()
+    except ValueError:
+        return response.status_code
+
+    if not isinstance(payload, dict):
+        return response.status_code
+
+    retry_after = (payload.get('parameters') or {}).get('retry_after')
+    if retry_after is not None:
+        return f'повтор через {retry_after} с'
+    return payload.get('description', response.status_code)
+
+
+def send_message(session, message):
     """Отправляет сообщение в Telegram чат."""
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-    except telegram.error.TelegramError as error:
-        error_message = f'Ошибка при отправке сообщения: {error}'
-        raise SendMessageError(error_message)
+        response = session.post(
+            url=TELEGRAM_ENDPOINT,
+            json={'chat_id': TELEGRAM_CHAT_ID, 'text': message},
+            timeout=TELEGRAM_TIMEOUT,
+        )
+    except requests.exceptions.RequestException as error:
+        error_message = SEND_MESSAGE_ERROR % error
+        raise SendMessageError(
+            error_message.replace(TELEGRAM_TOKEN, '<TELEGRAM_TOKEN>')
+        )
 
+    if response.status_code != HTTPStatus.OK:
+        raise SendMessageError(
+            TELEGRAM_STATUS_ERRORS.get(
+                response.status_code, TELEGRAM_STATUS_ERROR
+            ) % _telegram_error_details(response)
+        )
 
-def main():
-    """Основная логика работы бота."""
-    if not check_tokens():
-        error_message = 'Отсутствуют одна или несколько переменных окружения'
-        logger.critical(error_message)
-        raise SystemExit(error_message)
 
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    last_check_timestamp = int(time.time())
+def stop_polling(signum, frame):
+    """Останавливает опрос API при получении сигнала завершения."""
+    _stop.set()
 
-    last_sent_message = ''
 
-    while True:
+def check_status_update(state):
+    """Запрашивает статус работы и отправляет сообщение, если он изменился."""
+    response = get_api_answer(state.current_timestamp)
+    homeworks = check_response(response)
+    current_date = response.get('current_date')
 
-        try:
-            response = get_api_answer(last_check_timestamp)
-            last_check_timestamp = response.get('current_date')
+    if not homeworks:
+        state.current_timestamp = current_date
+        return False
 
-            homeworks = check_response(response)
-            if not homeworks:
-                continue
+    last_homework = homeworks[0]
+    homework_key = (
+        last_homework.get('homework_name'),
+        last_homework.get('status'),
+    )
+    if homework_key == state.last_homework_key:
+        state.current_timestamp = current_date
+        return False
 
-            last_homework = homeworks[0]
+    send_message(TELEGRAM_SESSION, parse_status(last_homework))
+    state.current_timestamp = current_date
+    state.last_homework_key = homework_key
+    state.last_error_message = ''
+    return True
 
-            message = parse_status(last_homework)
-            if message != last_sent_message:
-                send_message(bot, message)
-                last_sent_message = message
 
+def notify_error(state, error_message):
+    """Логирует сбой и сообщает о нём в Telegram, если он новый."""
+    logger.error(error_message)
+    if error_message == state.last_error_message:
+        return
+
+    try:
+        send_message(TELEGRAM_SESSION, error_message)
+    except SendMessageError as error:
+        logger.error(error)
+    else:
+        state.last_error_message = error_message
+
+
+def poll_homework_status(state):
+    """Опрашивает API, пока бот не получит сигнал завершения."""
+    while not _stop.is_set():
+
+        try:
+            status_changed = check_status_update(state)
         except SendMessageError as error:
-            error_message = (
-                f'Ошибка при отправке сообщения: {error}'
+            logger.error(error)
+        except (
+            GetStatusException,
+            AttributeError,
+            IndexError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as error:
+            notify_error(state, f'Сбой в работе бота: {error}')
+        else:
+            state.current_delay = RETRY_TIME
+            state.consecutive_failures = 0
+            state.poll_interval = (
+                MIN_POLL_INTERVAL if status_changed
+                else min(
+                    MAX_POLL_INTERVAL,
+                    state.poll_interval * POLL_INTERVAL_FACTOR,
+                )
             )
-            logging.error(error_message)
-        except Exception as error:
-            error_message = f'Сбой в работе бота: {error}'
-            logging.error(error_message)
-            if error_message != last_sent_message:
-                send_message(bot, error_message)
-                last_sent_message = error_message
-
-        time.sleep(RETRY_TIME)
+            _stop.wait(state.poll_interval * random.uniform(
+                1 - POLL_JITTER, 1 + POLL_JITTER
+            ))
+            continue
+
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= MAX_FAILURES:
+            logger.critical(
+                'Ошибки повторяются '
+                f'{state.consecutive_failures} раз подряд'
+            )
+        state.current_delay = min(MAX_RETRY_TIME, state.current_delay * 2)
+        _stop.wait(random.uniform(0, state.current_delay))
+
+
+def main():
+    """Основная логика работы бота."""
+    if not check_tokens():
+        raise SystemExit('Некорректные переменные окружения')
+
+    signal.signal(signal.SIGTERM, stop_polling)
+    signal.signal(signal.SIGINT, stop_polling)
+
+    try:
+        poll_homework_status(BotState(current_timestamp=int(time.time())))
+    finally:
+        logger.info('Бот завершает работу')
+        SESSION.close()
+        TELEGRAM_SESSION.close()
 
 
 if __name__ == '__main__':
@@ -1,8 +1,8 @@
+import json
 import os
 from http import HTTPStatus
 
 import requests
-import telegram
 import utils
 
 
@@ -44,6 +44,13 @@ class MockResponseGET:
         )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.raw_content = None
+
+    @property
+    def content(self):
+        if self.raw_content is not None:
+            return self.raw_content
+        return json.dumps(self.json()).encode()
 
     def json(self):
         data = {
@@ -53,24 +60,42 @@ class MockResponseGET:
         return data
 
 
-class MockTelegramBot:
+class MockResponsePOST:
 
-    def __init__(self, token=None, random_timestamp=None, **kwargs):
-        assert token is not None, (
-            'Проверьте, что вы передали токен бота Telegram'
-        )
-        self.random_timestamp = random_timestamp
+    def __init__(self, http_status=HTTPStatus.OK, payload=None):
+        self.status_code = http_status
+        self.payload = payload
+
+    def json(self):
+        if self.payload is not None:
+            return self.payload
+        return {'ok': self.status_code == HTTPStatus.OK}
+
+
+class MockTelegramSession:
+
+    def __init__(self, http_status=HTTPStatus.OK, payload=None):
+        self.http_status = http_status
+        self.payload = payload
+        self.sent = []
 
-    def send_message(self, chat_id=None, text=None, **kwargs):
-        assert chat_id is not None, (
-            'Проверьте, что вы передали chat_id= при отправке '
+    def post(self, url=None, json=None, **kwargs):
+        assert url.startswith('https://api.telegram.org/bot'), (
+            'Проверьте, что вы отправляете сообщение на ресурс API Telegram'
+        )
+        assert url.endswith('/sendMessage'), (
+            'Проверьте, что вы используете метод `sendMessage` API Telegram'
+        )
+        assert json is not None and json.get('chat_id') is not None, (
+            'Проверьте, что вы передали chat_id при отправке '
             'сообщения ботом Telegram'
         )
-        assert text is not None, (
-            'Проверьте, что вы передали text= при отправке '
+        assert json.get('text') is not None, (
+            'Проверьте, что вы передали text при отправке '
             'сообщения ботом Telegram'
         )
-        return self.random_timestamp
+        self.sent.append(json['text'])
+        return MockResponsePOST(self.http_status, self.payload)
 
 
 class TestHomework:
@@ -150,34 +175,74 @@ class TestHomework:
             f'функция {func_name} возвращает True'
         )
 
-    def test_bot_init_not_global(self):
+    def test_check_tokens_invalid(self, monkeypatch):
         import homework
 
-        assert not (hasattr(homework, 'bot') and isinstance(getattr(homework, 'bot'), telegram.Bot)), (
-            'Убедитесь, что бот инициализирован только в main()'
-        )
-
-    def test_logger(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+        func_name = 'check_tokens'
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        for chat_id in ('None', 'chat', ' '):
+            monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', chat_id)
+            assert not homework.check_tokens(), (
+                f'Проверьте, что функция {func_name} возвращает False '
+                f'при некорректном TELEGRAM_CHAT_ID={chat_id!r}'
+            )
 
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', 'abcdefg')
+        assert not homework.check_tokens(), (
+            f'Проверьте, что функция {func_name} возвращает False '
+            'при некорректном формате TELEGRAM_TOKEN'
+        )
 
+    def test_logger(self):
         import homework
 
         assert hasattr(homework, 'logging'), (
             'Убедитесь, что настроили логирование для вашего бота'
         )
 
-    def test_send_message(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
-
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
-
+    def test_send_message(self, monkeypatch):
         import homework
         utils.check_function(homework, 'send_message', 2)
 
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        session = MockTelegramSession()
+        homework.send_message(session, 'test')
+        assert session.sent == ['test'], (
+            'Проверьте, что функция `send_message` отправляет сообщение '
+            'в Telegram'
+        )
+
+        try:
+            homework.send_message(
+                MockTelegramSession(HTTPStatus.UNAUTHORIZED), 'test'
+            )
+        except homework.SendMessageError:
+            pass
+        else:
+            assert False, (
+                'Убедитесь, что функция `send_message` выбрасывает '
+                '`SendMessageError`, если Telegram отклонил сообщение'
+            )
+
+        for payload in ([], 'error', {'parameters': None}):
+            try:
+                homework.send_message(
+                    MockTelegramSession(
+                        HTTPStatus.TOO_MANY_REQUESTS, payload
+                    ),
+                    'test',
+                )
+            except homework.SendMessageError:
+                pass
+            else:
+                assert False, (
+                    'Убедитесь, что функция `send_message` выбрасывает '
+                    '`SendMessageError` при некорректном ответе Telegram: '
+                    f'{payload!r}'
+                )
+
     def test_get_api_answers(self, monkeypatch, random_timestamp,
                              current_timestamp, api_url):
         def mock_response_get(*args, **kwargs):
@@ -186,7 +251,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -232,7 +297,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_500_response_get))
 
         import homework
 
@@ -247,6 +312,96 @@ class TestHomework:
                 'когда API возвращает код, отличный от 200'
             )
 
+    def test_get_not_json_api_answer(self, monkeypatch, random_timestamp,
+                                     current_timestamp, api_url):
+        def mock_html_response_get(*args, **kwargs):
+            response = MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp, **kwargs
+            )
+            response.raw_content = b'<html>'
+            return response
+
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_html_response_get))
+
+        import homework
+
+        func_name = 'get_api_answer'
+        try:
+            homework.get_api_answer(current_timestamp)
+        except homework.GetStatusException:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` выбрасывает '
+                '`GetStatusException`, когда API возвращает не JSON'
+            )
+
+    def test_get_empty_api_answer(self, monkeypatch, random_timestamp,
+                                  current_timestamp, api_url):
+        def mock_empty_body_response_get(*args, **kwargs):
+            response = MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp, **kwargs
+            )
+            response.raw_content = b''
+            return response
+
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_empty_body_response_get))
+
+        import homework
+
+        func_name = 'get_api_answer'
+        result = homework.get_api_answer(current_timestamp)
+        assert result == {}, (
+            f'Убедитесь, что функция `{func_name}` возвращает пустой словарь, '
+            'когда API возвращает пустое тело ответа'
+        )
+        try:
+            homework.check_response(result)
+        except KeyError:
+            pass
+        else:
+            assert False, (
+                'Убедитесь, что функция `check_response` выбрасывает '
+                '`KeyError` для пустого ответа API'
+            )
+
+    def test_get_api_answer_cached(self, monkeypatch, random_timestamp,
+                                   current_timestamp, api_url):
+        def mock_response_get(*args, **kwargs):
+            return MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp, **kwargs
+            )
+
+        def mock_500_response_get(*args, **kwargs):
+            return MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp,
+                http_status=HTTPStatus.INTERNAL_SERVER_ERROR, **kwargs
+            )
+
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
+
+        import homework
+
+        func_name = 'get_api_answer'
+        result = homework.get_api_answer(current_timestamp)
+
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_500_response_get))
+        assert homework.get_api_answer(current_timestamp) == result, (
+            f'Убедитесь, что функция `{func_name}` не повторяет запрос '
+            'с тем же `from_date` в течение `CACHE_TTL`'
+        )
+
+        monkeypatch.setattr(homework, 'CACHE_TTL', 0)
+        monkeypatch.setattr(homework, 'CACHE_FALLBACK_ENABLED', True)
+        assert homework.get_api_answer(current_timestamp) == result, (
+            f'Убедитесь, что функция `{func_name}` возвращает последний '
+            'успешный ответ API, если включен `CACHE_FALLBACK_ENABLED`'
+        )
+
     def test_parse_status(self, random_timestamp):
         test_data = {
             "id": 123,
@@ -315,7 +470,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -352,7 +507,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -400,7 +555,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -448,7 +603,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -484,7 +639,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_no_homeworks_response_get))
 
         import homework
 
@@ -525,7 +680,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -565,7 +720,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -599,7 +754,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_empty_response_get))
 
         import homework
 
@@ -626,7 +781,7 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', staticmethod(mock_response_get))
 
         import homework
 
@@ -640,3 +795,196 @@ class TestHomework:
                 f'Убедитесь, что в функции `{func_name}` обрабатываете ситуацию, '
                 'когда API возвращает код, отличный от 200'
             )
+
+    def test_check_response_current_date_not_int(self):
+        import homework
+
+        func_name = 'check_response'
+        try:
+            homework.check_response(
+                {'homeworks': [], 'current_date': '2020-02-13T14:40:57Z'}
+            )
+        except TypeError:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что в функции `{func_name}` '
+                'обрабатывается ситуация, при которой ключ `current_date` '
+                'в ответе API имеет некорректный тип.'
+            )
+
+    def test_check_status_update(self, monkeypatch, random_timestamp):
+        import homework
+
+        responses = [
+            {'homeworks': [{'homework_name': 'hw', 'status': 'reviewing'}],
+             'current_date': random_timestamp},
+            {'homeworks': [{'homework_name': 'hw', 'status': 'reviewing'}],
+             'current_date': random_timestamp + 1},
+            {'homeworks': [], 'current_date': random_timestamp + 2},
+            {'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+             'current_date': random_timestamp + 3},
+        ]
+        requested_timestamps = []
+
+        def mock_get_api_answer(timestamp):
+            requested_timestamps.append(timestamp)
+            return responses.pop(0)
+
+        monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        session = MockTelegramSession()
+        monkeypatch.setattr(homework, 'TELEGRAM_SESSION', session)
+
+        func_name = 'check_status_update'
+        state = homework.BotState(current_timestamp=random_timestamp)
+        results = [homework.check_status_update(state) for _ in range(4)]
+        assert results == [True, False, False, True], (
+            f'Убедитесь, что функция `{func_name}` сообщает об изменении '
+            'только при смене названия или статуса работы'
+        )
+        assert len(session.sent) == 2, (
+            f'Убедитесь, что функция `{func_name}` не отправляет '
+            'повторное сообщение о неизменившемся статусе'
+        )
+        assert state.current_timestamp == random_timestamp + 3, (
+            f'Убедитесь, что функция `{func_name}` сохраняет '
+            '`current_date` из ответа API'
+        )
+
+        rejected_response = {
+            'homeworks': [{'homework_name': 'hw', 'status': 'rejected'}],
+            'current_date': random_timestamp + 4,
+        }
+        responses.append(rejected_response)
+        monkeypatch.setattr(
+            homework, 'TELEGRAM_SESSION',
+            MockTelegramSession(HTTPStatus.UNAUTHORIZED),
+        )
+        try:
+            homework.check_status_update(state)
+        except homework.SendMessageError:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` пробрасывает '
+                '`SendMessageError`'
+            )
+        assert state.last_homework_key == ('hw', 'approved'), (
+            f'Убедитесь, что функция `{func_name}` не запоминает статус, '
+            'сообщение о котором не удалось отправить'
+        )
+        assert state.current_timestamp == random_timestamp + 3, (
+            f'Убедитесь, что функция `{func_name}` не сдвигает `from_date`, '
+            'если сообщение о новом статусе не удалось отправить'
+        )
+
+        responses.append(rejected_response)
+        session = MockTelegramSession()
+        monkeypatch.setattr(homework, 'TELEGRAM_SESSION', session)
+        assert homework.check_status_update(state), (
+            f'Убедитесь, что функция `{func_name}` повторяет отправку '
+            'сообщения о статусе после неудачной попытки'
+        )
+        assert requested_timestamps[-1] == random_timestamp + 3, (
+            f'Убедитесь, что функция `{func_name}` повторно запрашивает '
+            'API с прежним `from_date`'
+        )
+        assert session.sent == [homework.parse_status(
+            rejected_response['homeworks'][0]
+        )], (
+            f'Убедитесь, что функция `{func_name}` отправляет сообщение '
+            'о статусе, которое не удалось отправить ранее'
+        )
+        assert state.current_timestamp == random_timestamp + 4, (
+            f'Убедитесь, что функция `{func_name}` сохраняет '
+            '`current_date` после успешной отправки'
+        )
+
+    def test_notify_error(self, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        session = MockTelegramSession()
+        monkeypatch.setattr(homework, 'TELEGRAM_SESSION', session)
+
+        func_name = 'notify_error'
+        state = homework.BotState()
+        for message in ('first', 'first', 'second'):
+            homework.notify_error(state, message)
+        assert session.sent == ['first', 'second'], (
+            f'Убедитесь, что функция `{func_name}` отправляет '
+            'сообщение об одной и той же ошибке только один раз'
+        )
+
+        monkeypatch.setattr(
+            homework, 'TELEGRAM_SESSION',
+            MockTelegramSession(HTTPStatus.UNAUTHORIZED),
+        )
+        homework.notify_error(state, 'third')
+        assert state.last_error_message == 'second', (
+            f'Убедитесь, что функция `{func_name}` не запоминает ошибку, '
+            'сообщение о которой не удалось отправить'
+        )
+
+    def test_poll_homework_status(self, monkeypatch):
+        import homework
+
+        class MockEvent:
+
+            def __init__(self, waits_qty):
+                self.waits_qty = waits_qty
+                self.waits = []
+
+            def is_set(self):
+                return len(self.waits) >= self.waits_qty
+
+            def wait(self, timeout=None):
+                self.waits.append(timeout)
+                return self.is_set()
+
+        outcomes = [
+            True, False,
+            homework.GetStatusException('error'),
+            homework.GetStatusException('error'),
+            False,
+        ]
+
+        def mock_check_status_update(state):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        errors = []
+        stop = MockEvent(len(outcomes))
+        monkeypatch.setattr(homework, '_stop', stop)
+        monkeypatch.setattr(
+            homework, 'check_status_update', mock_check_status_update
+        )
+        monkeypatch.setattr(
+            homework, 'notify_error',
+            lambda state, message: errors.append(message),
+        )
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        homework.poll_homework_status(homework.BotState())
+
+        jitter = 1 + homework.POLL_JITTER
+        min_interval = homework.MIN_POLL_INTERVAL
+        factor = homework.POLL_INTERVAL_FACTOR
+        expected = [
+            min_interval * jitter,
+            min_interval * factor * jitter,
+            homework.RETRY_TIME * 2,
+            homework.RETRY_TIME * 4,
+            min_interval * factor ** 2 * jitter,
+        ]
+        assert stop.waits == expected, (
+            'Убедитесь, что интервал опроса растёт, пока статус не меняется, '
+            'а при сбоях задержка удваивается и сбрасывается после '
+            'успешного запроса'
+        )
+        assert len(errors) == 2, (
+            'Убедитесь, что о каждом сбое сообщается через `notify_error`'
+        )